@@ -1,82 +1,326 @@
-import boto3
-from modules import Instance, from_raw_data_to_instance
-from typing import List
-import logging.config
-
-
-def describe_instances_paginated(client) -> List[dict]:
-    """
-     The method pulls all the instances from aws, extracts the instances from the response and returns them
-    :param client: a botocore.client.EC2 object
-    :return: list of dictionaries each describing an instance
-    """
-
-    instances = []
-    # Pulling all instances from aws.
-    response = client.describe_instances()
-    for reservation in response["Reservations"]:
-        # Extract the Instances from the response dictionary.
-        instances.extend(reservation['Instances'])
-
-    while "NextToken" in response:
-        # As long as "NextToken is in the response (there are still instances to pull) keep pulling the next instances.
-        response = client.describe_instances(NextToken=response["NextToken"])
-        for reservation in response["Reservations"]:
-            instances.extend(reservation['Instances'])
-    return instances
-
-
-def get_all_aws_instances(specific_regions=None) -> List[Instance]:
-    """
-    The method pulls the instances from aws, parses them into human readable objects and returns them
-    :param specific_regions: A list of aws regions to pull instances from
-    :return: A list of Instances objects extracted and parsed from aws.
-    """
-    all_aws_instances = []
-    all_aws_regions = ["us-east-2", "us-east-1", "us-west-1", "us-west-2", "af-south-1", "ap-east-1", "ap-south-1",
-                       "ap-northeast-3", "ap-northeast-2", "ap-southeast-1", "ap-southeast-2", "ap-northeast-1",
-                       "ca-central-1", "eu-central-1", "eu-west-1", "eu-west-2", "eu-south-1", "eu-west-3",
-                       "eu-north-1", "me-south-1", "sa-east-1"]
-    # By default the method pulls the instances from all regions but if specific regions were given it pulls from them
-    if specific_regions:
-        regions = specific_regions
-    else:
-        regions = all_aws_regions
-    logging.info("started pulling instances")
-    for region in regions:
-
-        client = boto3.client('ec2', region_name=region)
-        try:
-            regions_instances = describe_instances_paginated(client)
-            all_aws_instances.extend(regions_instances)
-            logging.debug(f"pulled instances from region {region}")
-        except Exception:
-            # skips on all regions that the given credentials have no permissions to access.
-            logging.error(f"Could not pull instances from region {region}")
-            pass
-    parsed_instances = []
-    logging.info("finished successfully pulling instances")
-    logging.info("processing raw data into objects")
-    for instance_dict in all_aws_instances:
-        # parse all instances pulled from aws into Instance objects
-
-        instance = from_raw_data_to_instance(instance_dict)
-        parsed_instances.append(instance)
-    logging.info("finished processing the raw data")
-    return parsed_instances
-
-
-if __name__ == '__main__':
-    # disabling all loggers from imported modules to not spam the root logger.
-    logging.config.dictConfig({
-        'version': 1,
-        'disable_existing_loggers': True,
-    })
-    # configuring the root logger.
-    logging.basicConfig(level=logging.DEBUG)
-
-    active_regions = ["us-east-2", "us-west-2"]
-
-    # Run is configured to go over active_regions here. to go over all regions, call the function without any arguments.
-    all_aws_instances = get_all_aws_instances(specific_regions=active_regions)
-
+import boto3
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from botocore.config import Config
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from modules import Instance, from_raw_data_to_instance
+from typing import Iterator, List, Tuple
+import logging.config
+
+# The full list of aws regions, built once at import instead of on every call.
+_ALL_AWS_REGIONS = ("us-east-2", "us-east-1", "us-west-1", "us-west-2", "af-south-1", "ap-east-1", "ap-south-1",
+                    "ap-northeast-3", "ap-northeast-2", "ap-southeast-1", "ap-southeast-2", "ap-northeast-1",
+                    "ca-central-1", "eu-central-1", "eu-west-1", "eu-west-2", "eu-south-1", "eu-west-3",
+                    "eu-north-1", "me-south-1", "sa-east-1")
+
+# Caps the number of region requests that are in flight at once.
+_MAX_CONCURRENT_REQUESTS = 32
+
+# Parsing is only split across processes from this many instances on. Below that, starting the
+# worker processes and pickling the data costs more than the parallelism gains.
+_PARALLEL_PARSE_THRESHOLD = 10000
+
+# How many instances each parse task carries. Large chunks amortize the pickling of the raw
+# dictionaries between the processes over many instances.
+_PARALLEL_PARSE_CHUNK_SIZE = 256
+
+# How long the cached per-region results stay fresh, in seconds.
+_CACHE_TTL_SECONDS = 60
+
+# How long the on disk per-region results stay fresh, in seconds. The disk cache serves repeated
+# runs of the program so it lives longer than the in memory one.
+_DISK_CACHE_TTL_SECONDS = 15 * 60
+
+# Cache of the raw per-region results, keyed by (region, time bucket) so that an entry stops
+# matching (and therefore expires) once the ttl has passed. Guarded by the lock below.
+_REGION_CACHE = {}
+_REGION_CACHE_LOCK = threading.Lock()
+
+# All the clients share botocore's http connection pool, so it is sized to cover the concurrent
+# requests instead of botocore's default of 10 connections that the worker threads would queue on.
+# The adaptive retry mode backs off client side when aws throttles, so the concurrent regions do
+# not amplify a throttling storm by retrying all at once, and keepalive saves reconnect handshakes.
+_CLIENT_CONFIG = Config(max_pool_connections=64,
+                        retries={'max_attempts': 10, 'mode': 'adaptive'},
+                        tcp_keepalive=True)
+
+
+@lru_cache(maxsize=1)
+def _get_session():
+    """
+    The method returns the shared boto3 session, creating it on the first call. The session is
+    expensive to build (it loads the credential and config chain) so one is kept for the process.
+    :return: a boto3.Session object
+    """
+    return boto3.Session()
+
+
+@lru_cache(maxsize=None)
+def _get_ec2(region):
+    """
+    The method returns the ec2 client of a region, creating it on the first request and serving the
+    same client on the following ones. Creating a client costs tens of milliseconds (credential
+    resolution, endpoint discovery, loading the service model) so each one is built once per process.
+    :param region: the aws region the client belongs to
+    :return: a botocore.client.EC2 object
+    """
+    return _get_session().client('ec2', region_name=region, config=_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def get_enabled_regions() -> Tuple[str, ...]:
+    """
+    The method discovers the regions that are actually enabled for the account, as an alternative to
+    the static region list, and caches the answer for the lifetime of the process.
+    :return: a tuple of the names of the enabled regions
+    """
+    response = _get_ec2("us-east-1").describe_regions()
+    return tuple(region["RegionName"] for region in response["Regions"])
+
+
+def describe_instances_paginated(client, filters=None) -> List[dict]:
+    """
+     The method pulls all the instances from aws, extracts the instances from the response and returns them
+    :param client: a botocore.client.EC2 object
+    :param filters: an optional list of ec2 Filters dictionaries, for example
+                    [{'Name': 'instance-state-name', 'Values': ['running']}]. Filtering happens on
+                    the aws side, so both the payload over the wire and the parsing shrink to just
+                    the instances of interest.
+    :return: list of dictionaries each describing an instance
+    """
+
+    # The paginator threads the NextToken through the calls itself and retries throttled pages.
+    # Requesting the maximum page size (1000 vs the default 100) cuts the round-trips per region.
+    paginator = client.get_paginator('describe_instances')
+    paginate_kwargs = {'PaginationConfig': {'PageSize': 1000}}
+    if filters:
+        paginate_kwargs['Filters'] = filters
+    # Extract the Instances of every reservation on every page in a single pass. Building the list
+    # from one chained generator avoids growing it with a Python level extend call per reservation.
+    return list(chain.from_iterable(reservation['Instances']
+                                    for page in paginator.paginate(**paginate_kwargs)
+                                    for reservation in page["Reservations"]))
+
+
+def _disk_cache_path(cache_dir, region) -> str:
+    """
+    The method builds the path of the on disk cache file of a region.
+    :param cache_dir: the root directory of the on disk cache
+    :param region: the aws region the cache file belongs to
+    :return: the path of the region's cache file
+    """
+    return os.path.join(cache_dir, region, "describe_instances.json")
+
+
+def _load_from_disk_cache(cache_dir, region):
+    """
+    The method loads a region's instances from the on disk cache.
+    :param cache_dir: the root directory of the on disk cache
+    :param region: the aws region to load the instances of
+    :return: the cached list of instances, or None when the region has no fresh cache file
+    """
+    path = _disk_cache_path(cache_dir, region)
+    try:
+        if os.path.getmtime(path) <= time.time() - _DISK_CACHE_TTL_SECONDS:
+            return None
+        with open(path) as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        # A missing or unreadable cache file simply means the region has to be pulled from aws.
+        return None
+
+
+def _write_to_disk_cache(cache_dir, region, instances):
+    """
+    The method writes a region's instances to the on disk cache.
+    :param cache_dir: the root directory of the on disk cache
+    :param region: the aws region the instances were pulled from
+    :param instances: list of dictionaries each describing an instance
+    """
+    path = _disk_cache_path(cache_dir, region)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as cache_file:
+            # Values json cannot represent (for example the LaunchTime datetime) are stored as strings.
+            json.dump(instances, cache_file, default=str)
+    except OSError:
+        logging.error("could not write the cache file for region %s", region)
+
+
+def _pull_raw_region_results(regions, use_cache, cache_dir, filters=None):
+    """
+    The method runs the concurrent fan-out over the given regions and yields each region's raw
+    instances as its result is collected, so callers can process a region while others are still
+    being pulled and the raw data of all regions never has to live in memory at once.
+    :param regions: the aws regions to pull instances from
+    :param use_cache: whether recent results may be served from the in memory cache instead of aws
+    :param cache_dir: the root directory of the on disk cache, or None when it is not used
+    :param filters: an optional list of ec2 Filters dictionaries forwarded to describe_instances
+    :return: a generator of lists of dictionaries, one list per region that could be pulled
+    """
+    # The calls to aws are network bound so one request per region is issued concurrently instead of
+    # waiting on each region's round-trip one after the other.
+    # Results pulled in the same time bucket share a cache key, so a cached entry expires once
+    # the ttl has passed and the bucket changes. The filters are part of the key so differently
+    # filtered results never serve each other. The disk cache files are keyed by region only, so
+    # filtered results are not cached on disk at all.
+    filters_key = json.dumps(filters, sort_keys=True) if filters else None
+    time_bucket = int(time.time() // _CACHE_TTL_SECONDS)
+    with ThreadPoolExecutor(max_workers=min(len(regions), _MAX_CONCURRENT_REQUESTS)) as executor:
+        region_futures = []
+        for region in regions:
+            if use_cache:
+                with _REGION_CACHE_LOCK:
+                    cached_instances = _REGION_CACHE.get((region, filters_key, time_bucket))
+                if cached_instances is not None:
+                    # Serve the region from the cache through a resolved future, so the collection
+                    # loop below does not need to care where each result came from.
+                    future = Future()
+                    future.set_result(cached_instances)
+                    region_futures.append((region, future, True))
+                    continue
+            if cache_dir and not filters:
+                cached_instances = _load_from_disk_cache(cache_dir, region)
+                if cached_instances is not None:
+                    future = Future()
+                    future.set_result(cached_instances)
+                    region_futures.append((region, future, True))
+                    continue
+            # The clients are fetched in the main thread because creating clients from the shared
+            # session is not thread safe, while using a ready client from a worker thread is.
+            client = _get_ec2(region)
+            region_futures.append((region, executor.submit(describe_instances_paginated, client, filters), False))
+
+        for region, future, from_cache in region_futures:
+            try:
+                regions_instances = future.result()
+            except Exception:
+                # skips on all regions that the given credentials have no permissions to access.
+                logging.error("Could not pull instances from region %s", region)
+                continue
+            # Results that came from a cache are not written back, so serving a cached result
+            # does not extend its lifetime.
+            if use_cache and not from_cache:
+                with _REGION_CACHE_LOCK:
+                    # Drop expired entries so the cache does not grow without bound over time.
+                    for key in [key for key in _REGION_CACHE if key[2] != time_bucket]:
+                        del _REGION_CACHE[key]
+                    _REGION_CACHE[(region, filters_key, time_bucket)] = regions_instances
+            if cache_dir and not filters and not from_cache:
+                _write_to_disk_cache(cache_dir, region, regions_instances)
+            logging.debug("pulled instances from region %s", region)
+            yield regions_instances
+
+
+def iter_all_aws_instances(specific_regions=None, use_cache=True, cache_dir=None, filters=None) -> Iterator[Instance]:
+    """
+    The method pulls the instances from aws and yields them as human readable objects one by one.
+    Unlike get_all_aws_instances the whole data set is never materialized at once: callers get the
+    first instances as soon as the first region answers, and a region's raw dictionaries can be
+    reclaimed as soon as its instances were yielded, which roughly halves the peak memory use.
+    :param specific_regions: A list of aws regions to pull instances from
+    :param use_cache: Whether recent results may be served from the in memory cache instead of aws.
+                      Freshness critical callers should pass False to always hit aws.
+    :param cache_dir: A directory to keep an on disk cache of the raw results in. When given, fresh
+                      cache files are served instead of pulling from aws, which lets repeated runs
+                      of the program skip the network fan-out entirely.
+    :param filters: An optional list of ec2 Filters dictionaries, for example
+                    [{'Name': 'instance-state-name', 'Values': ['running']}], applied on the aws
+                    side so only the instances of interest are sent and parsed.
+    :return: An iterator of Instance objects extracted and parsed from aws.
+    """
+    # By default the method pulls the instances from all regions but if specific regions were given it pulls from them
+    if specific_regions:
+        regions = specific_regions
+    else:
+        regions = _ALL_AWS_REGIONS
+    logging.info("started pulling instances")
+    for regions_instances in _pull_raw_region_results(regions, use_cache, cache_dir, filters):
+        for instance_dict in regions_instances:
+            yield from_raw_data_to_instance(instance_dict)
+    logging.info("finished pulling and processing the instances")
+
+
+def _get_all_aws_instances(specific_regions=None, use_cache=True, cache_dir=None, filters=None) -> List[Instance]:
+    """
+    The method pulls the instances from aws, parses them into human readable objects and returns them
+    Callers that do not need the whole list at once can use iter_all_aws_instances instead.
+    :param specific_regions: A list of aws regions to pull instances from
+    :param use_cache: Whether recent results may be served from the in memory cache instead of aws.
+                      Freshness critical callers should pass False to always hit aws.
+    :param cache_dir: A directory to keep an on disk cache of the raw results in. When given, fresh
+                      cache files are served instead of pulling from aws, which lets repeated runs
+                      of the program skip the network fan-out entirely.
+    :param filters: An optional list of ec2 Filters dictionaries, for example
+                    [{'Name': 'instance-state-name', 'Values': ['running']}], applied on the aws
+                    side so only the instances of interest are sent and parsed.
+    :return: A list of Instances objects extracted and parsed from aws.
+    """
+    all_aws_instances = []
+    # By default the method pulls the instances from all regions but if specific regions were given it pulls from them
+    if specific_regions:
+        regions = specific_regions
+    else:
+        regions = _ALL_AWS_REGIONS
+    logging.info("started pulling instances")
+    for regions_instances in _pull_raw_region_results(regions, use_cache, cache_dir, filters):
+        all_aws_instances.extend(regions_instances)
+    logging.info("finished successfully pulling instances")
+    logging.info("processing raw data into objects")
+    if len(all_aws_instances) >= _PARALLEL_PARSE_THRESHOLD:
+        # The dict to Instance conversion is pure cpu and gil bound, so for large accounts it is
+        # split across processes to scale with the machine's cores.
+        with ProcessPoolExecutor() as parse_executor:
+            parsed_instances = list(parse_executor.map(from_raw_data_to_instance, all_aws_instances,
+                                                       chunksize=_PARALLEL_PARSE_CHUNK_SIZE))
+    else:
+        # parse all instances pulled from aws into Instance objects. A comprehension appends in C
+        # instead of looking up .append per instance.
+        parsed_instances = [from_raw_data_to_instance(instance_dict) for instance_dict in all_aws_instances]
+    logging.info("finished processing the raw data")
+    return parsed_instances
+
+
+def get_all_aws_instances(specific_regions=None, use_cache=True, cache_dir=None, filters=None) -> List[Instance]:
+    """
+    The method pulls the instances from aws, parses them into human readable objects and returns them
+    Callers that do not need the whole list at once can use iter_all_aws_instances instead.
+    Setting the CYMPTOM_PROFILE environment variable runs the call under cProfile and prints the 30
+    most expensive call sites, so where the time of a real run goes can be checked without touching
+    the code. See _get_all_aws_instances for the parameters.
+    :return: A list of Instances objects extracted and parsed from aws.
+    """
+    if not os.environ.get('CYMPTOM_PROFILE'):
+        return _get_all_aws_instances(specific_regions, use_cache, cache_dir, filters)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _get_all_aws_instances(specific_regions, use_cache, cache_dir, filters)
+    finally:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+
+
+if __name__ == '__main__':
+    # disabling all loggers from imported modules to not spam the root logger.
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': True,
+    })
+    # configuring the root logger.
+    logging.basicConfig(level=logging.DEBUG)
+
+    active_regions = ["us-east-2", "us-west-2"]
+
+    # Run is configured to go over active_regions here. to go over all regions, call the function without any arguments.
+    # To go over just the regions that are enabled for the account instead of the static list, call
+    # get_all_aws_instances(specific_regions=get_enabled_regions()).
+    all_aws_instances = get_all_aws_instances(specific_regions=active_regions)
+
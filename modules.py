@@ -1,128 +1,200 @@
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List
-from ipaddress import ip_address
-import logging
-
-
-@dataclass()
-class Instance:
-    # The class contains all useful information on an aws instance.
-
-    image_id: str                             # The ID of the AMI used to launch the instance.
-    instance_id: str                          # The ID of the instance.
-    network_interfaces: list                  # The network interfaces for the instance.
-    state: dict                               # The current state of the instance.
-    launch_time: datetime                     # The time the instance was launched.
-    tags: List[dict]                          # The tags assigned to the instance. consist of "Key" and "Value" as keys.
-    cpu_details: dict                         # The details of the cpu of the instance. consist of "CoreCount" and "ThreadsPerCore" as keys.
-    instance_type: str                        # The instance type.
-    security_groups: List[dict]               # The security groups for the instance. Consist of 'GroupName' and 'GroupId' as keys.
-    client_token: str                         # The idempotency token you provided when you launched the instance, if applicable.
-    state_transition_reason: str              # The reason for the most recent state transition. This might be an empty string.
-    root_device_name: str                     # The device name of the root device volume (for example, /dev/sda1 ).
-    ram_disk_id: str = ""                     # The RAM disk associated with this instance, if applicable.]
-    platform: str = ""                        # The platform details value for the instance. for example "Linux/UNIX"
-    kernel_id: str = ""                       # The kernel associated with this instance, if applicable.
-    Host_id: str = ""                         # The ID of the Dedicated Host on which the instance resides.
-
-
-def from_raw_data_to_instance(raw_data: dict) -> Instance:
-    """
-    The function builds Instance object out of a dictionary describing an instance that was pulled from aws.
-    :param raw_data: dictionary describing an instance pulled from aws
-    :return: Instance object describing the instance from the input
-    """
-
-    # List of the NetworkInterface objects that will be used as one of Instance's properties.
-    parsed_interfaces = []
-
-    for interface in raw_data["NetworkInterfaces"]:
-        # Create a NetworkInterface object from the response's dictionary.
-        parsed_interface = from_raw_data_to_network_interface(interface)
-
-        parsed_interfaces.append(parsed_interface)
-
-    # create an Instance object from the response's dictionary.
-    parsed_instance = Instance(image_id=raw_data["ImageId"], instance_id=raw_data["InstanceId"],
-                               network_interfaces=parsed_interfaces, state=raw_data["State"],
-                               launch_time=raw_data["LaunchTime"], tags=raw_data["Tags"],
-                               cpu_details=raw_data["CpuOptions"], instance_type=raw_data["InstanceType"],
-                               security_groups=raw_data["SecurityGroups"], client_token=raw_data["ClientToken"],
-                               state_transition_reason=raw_data["StateTransitionReason"],
-                               root_device_name=raw_data["RootDeviceName"])
-
-    # check the response's dictionary for the fields that are optional and parse them into the Instance object.
-    if "RamdiskId" in raw_data:
-        parsed_instance.ram_disk_id = raw_data["RamdiskId"]
-    if "PlatformDetails" in raw_data:
-        parsed_instance.platform = raw_data["PlatformDetails"]
-    if "KernelId" in raw_data:
-        parsed_instance.kernel_id = raw_data["KernelId"]
-    if "HostId" in raw_data:
-        parsed_instance.Host_id = raw_data["HostId"]
-
-    return parsed_instance
-
-
-@dataclass()
-class NetworkInterface:
-    # The class contains all useful information on an a network interface used in aws instance.
-
-    ip_owner_id: str
-    public_dns_name: str
-    mac_address: str                          # mac address of the interface. (type could be changed into mac_address but require installing a package.)
-    network_interface_id: str
-    owner_id: str
-    private_dns_name: str
-    subnet_id: str
-    status: str
-    public_ip_address: ip_address = None
-    ipv6_address: ip_address = None
-    private_ip_address: ip_address = None
-
-
-def from_raw_data_to_network_interface(raw_data: dict) -> NetworkInterface:
-    """
-       The function builds NetworkInterface object out of a dictionary describing
-       a network interface that was pulled from aws.
-       :param raw_data: dictionary describing a network interface pulled from aws
-       :return: NetworkInterface object describing the network interface from the input
-       """
-
-    association = raw_data["Association"]
-    # Create a NetworkInterface from the raw data's dictionary.
-    parsed_interface = NetworkInterface(ip_owner_id=association["IpOwnerId"],
-                                        public_dns_name=association["PublicDnsName"],
-                                        mac_address=raw_data["MacAddress"],
-                                        network_interface_id=raw_data["NetworkInterfaceId"],
-                                        owner_id=raw_data["OwnerId"],
-                                        private_dns_name=raw_data["PrivateDnsName"],
-                                        subnet_id=raw_data["SubnetId"], status=raw_data["Status"]
-                                        )
-
-    # check the input dictionary for optional fields, check if the input is vlad ip address and parse it into the object
-    ipv6_address = raw_data["Ipv6Addresses"]
-    public_ip = association["PublicIp"]
-    private_ip_address = raw_data["PrivateIpAddress"]
-    if ipv6_address:
-        try:
-            parsed_interface.ipv6_address = ip_address(ipv6_address)
-        except ValueError:
-            logging.error(f"ipv6 address is not valid in network interface with the id "
-                          f"{parsed_interface.network_interface_id}")
-
-    if public_ip:
-        try:
-            parsed_interface.public_ip_address = ip_address(public_ip)
-        except ValueError:
-            logging.debug(f"public_ip address is not valid in network interface with the id "
-                          f"{parsed_interface.network_interface_id}")
-
-    if private_ip_address:
-        try:
-            parsed_interface.private_ip_address = ip_address(private_ip_address)
-        except ValueError:
-            logging.error(f"private_ip_address address is not valid in network interface with the id "
-                          f"{parsed_interface.network_interface_id}")
-    return parsed_interface
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from ipaddress import ip_address
+import logging
+import re
+
+# Parsing an address string costs about a microsecond, and many interfaces share addresses (for
+# example aws owned dns resolver ips), so the parses are cached. The returned objects are immutable
+# and therefore safe to share.
+_parse_ip_address = lru_cache(maxsize=4096)(ip_address)
+
+# Cheap shape check for ipv4 addresses (for ipv6 a colon in the string is discriminating enough).
+# It complements ip_address rather than replaces it - strings that pass the shape check, for
+# example ones with octets above 255, are still validated by the real parser.
+_IPV4_RE = re.compile(r'^\d{1,3}(?:\.\d{1,3}){3}$')
+
+
+def _parse_optional_ip(address: str) -> Optional[ip_address]:
+    """
+    The function parses an address string into an ip address object, tolerating malformed input.
+    Clearly malformed strings are rejected by a cheap shape check up front, so they do not pay for
+    raising an exception out of ip_address - raising is expensive when much of the input is bad.
+    :param address: the address string to parse
+    :return: the parsed ip address object, or None when the address is not valid
+    """
+    if ':' not in address and _IPV4_RE.match(address) is None:
+        return None
+    try:
+        return _parse_ip_address(address)
+    except ValueError:
+        return None
+
+
+# slots=True stores the fields in __slots__ instead of a per object __dict__, which shrinks every
+# object and speeds up attribute access. eq=False skips generating __eq__ since instances are never
+# compared. Both matter when many thousands of instances are materialized.
+@dataclass(slots=True, eq=False)
+class Instance:
+    # The class contains all useful information on an aws instance.
+
+    image_id: str                             # The ID of the AMI used to launch the instance.
+    instance_id: str                          # The ID of the instance.
+    network_interfaces: list                  # The network interfaces for the instance.
+    state: dict                               # The current state of the instance.
+    launch_time: datetime                     # The time the instance was launched.
+    tags: List[dict]                          # The tags assigned to the instance. consist of "Key" and "Value" as keys.
+    cpu_details: dict                         # The details of the cpu of the instance. consist of "CoreCount" and "ThreadsPerCore" as keys.
+    instance_type: str                        # The instance type.
+    security_groups: List[dict]               # The security groups for the instance. Consist of 'GroupName' and 'GroupId' as keys.
+    client_token: str                         # The idempotency token you provided when you launched the instance, if applicable.
+    state_transition_reason: str              # The reason for the most recent state transition. This might be an empty string.
+    root_device_name: str                     # The device name of the root device volume (for example, /dev/sda1 ).
+    ram_disk_id: str = ""                     # The RAM disk associated with this instance, if applicable.]
+    platform: str = ""                        # The platform details value for the instance. for example "Linux/UNIX"
+    kernel_id: str = ""                       # The kernel associated with this instance, if applicable.
+    Host_id: str = ""                         # The ID of the Dedicated Host on which the instance resides.
+
+
+def from_raw_data_to_instance(raw_data: dict) -> Instance:
+    """
+    The function builds Instance object out of a dictionary describing an instance that was pulled from aws.
+    :param raw_data: dictionary describing an instance pulled from aws
+    :return: Instance object describing the instance from the input
+    """
+
+    # Create the NetworkInterface objects that will be used as one of Instance's properties.
+    # A comprehension appends in C instead of looking up .append per interface.
+    parsed_interfaces = [from_raw_data_to_network_interface(interface)
+                         for interface in raw_data["NetworkInterfaces"]]
+
+    # create an Instance object from the response's dictionary in a single constructor call.
+    # The optional fields fall back to their defaults through .get, which skips the membership
+    # probes and extra attribute sets of filling them in after construction.
+    return Instance(image_id=raw_data["ImageId"], instance_id=raw_data["InstanceId"],
+                    network_interfaces=parsed_interfaces, state=raw_data["State"],
+                    launch_time=raw_data["LaunchTime"], tags=raw_data["Tags"],
+                    cpu_details=raw_data["CpuOptions"], instance_type=raw_data["InstanceType"],
+                    security_groups=raw_data["SecurityGroups"], client_token=raw_data["ClientToken"],
+                    state_transition_reason=raw_data["StateTransitionReason"],
+                    root_device_name=raw_data["RootDeviceName"],
+                    ram_disk_id=raw_data.get("RamdiskId", ""),
+                    platform=raw_data.get("PlatformDetails", ""),
+                    kernel_id=raw_data.get("KernelId", ""),
+                    Host_id=raw_data.get("HostId", ""))
+
+
+def from_raw_data_to_frame(raw_list: List[dict]) -> Tuple[dict, dict]:
+    """
+    The function builds a columnar (struct of arrays) view of instances pulled from aws.
+    Unlike from_raw_data_to_instance no per instance objects are allocated, so for large amounts of
+    instances the result is much cheaper to build, holds far less memory and is faster to filter or
+    aggregate over column by column.
+    :param raw_list: list of dictionaries each describing an instance pulled from aws
+    :return: two dictionaries mapping column names to lists - one for the instances and one for
+             their network interfaces. The interfaces columns carry the owning instance's
+             instance_id so the two can be joined.
+    """
+
+    instances_frame = {
+        'image_id': [raw_data["ImageId"] for raw_data in raw_list],
+        'instance_id': [raw_data["InstanceId"] for raw_data in raw_list],
+        'state': [raw_data["State"] for raw_data in raw_list],
+        'launch_time': [raw_data["LaunchTime"] for raw_data in raw_list],
+        'tags': [raw_data["Tags"] for raw_data in raw_list],
+        'cpu_details': [raw_data["CpuOptions"] for raw_data in raw_list],
+        'instance_type': [raw_data["InstanceType"] for raw_data in raw_list],
+        'security_groups': [raw_data["SecurityGroups"] for raw_data in raw_list],
+        'client_token': [raw_data["ClientToken"] for raw_data in raw_list],
+        'state_transition_reason': [raw_data["StateTransitionReason"] for raw_data in raw_list],
+        'root_device_name': [raw_data["RootDeviceName"] for raw_data in raw_list],
+        'ram_disk_id': [raw_data.get("RamdiskId", "") for raw_data in raw_list],
+        'platform': [raw_data.get("PlatformDetails", "") for raw_data in raw_list],
+        'kernel_id': [raw_data.get("KernelId", "") for raw_data in raw_list],
+        'host_id': [raw_data.get("HostId", "") for raw_data in raw_list],
+    }
+
+    # One row per network interface, flattened over all the instances together with the id of the
+    # instance each interface belongs to.
+    interface_rows = [(raw_data["InstanceId"], interface)
+                      for raw_data in raw_list for interface in raw_data["NetworkInterfaces"]]
+    interfaces_frame = {
+        'instance_id': [instance_id for instance_id, interface in interface_rows],
+        'ip_owner_id': [interface["Association"]["IpOwnerId"] for _, interface in interface_rows],
+        'public_dns_name': [interface["Association"]["PublicDnsName"] for _, interface in interface_rows],
+        'mac_address': [interface["MacAddress"] for _, interface in interface_rows],
+        'network_interface_id': [interface["NetworkInterfaceId"] for _, interface in interface_rows],
+        'owner_id': [interface["OwnerId"] for _, interface in interface_rows],
+        'private_dns_name': [interface["PrivateDnsName"] for _, interface in interface_rows],
+        'subnet_id': [interface["SubnetId"] for _, interface in interface_rows],
+        'status': [interface["Status"] for _, interface in interface_rows],
+        'public_ip_address': [interface["Association"].get("PublicIp") for _, interface in interface_rows],
+        'ipv6_addresses': [interface["Ipv6Addresses"] for _, interface in interface_rows],
+        'private_ip_address': [interface.get("PrivateIpAddress") for _, interface in interface_rows],
+    }
+
+    return instances_frame, interfaces_frame
+
+
+# slots=True and eq=False for the same reasons as in Instance.
+@dataclass(slots=True, eq=False)
+class NetworkInterface:
+    # The class contains all useful information on an a network interface used in aws instance.
+
+    ip_owner_id: str
+    public_dns_name: str
+    mac_address: str                          # mac address of the interface. (type could be changed into mac_address but require installing a package.)
+    network_interface_id: str
+    owner_id: str
+    private_dns_name: str
+    subnet_id: str
+    status: str
+    public_ip_address: ip_address = None
+    ipv6_address: ip_address = None
+    private_ip_address: ip_address = None
+
+
+def from_raw_data_to_network_interface(raw_data: dict) -> NetworkInterface:
+    """
+       The function builds NetworkInterface object out of a dictionary describing
+       a network interface that was pulled from aws.
+       :param raw_data: dictionary describing a network interface pulled from aws
+       :return: NetworkInterface object describing the network interface from the input
+       """
+
+    association = raw_data["Association"]
+    # Create a NetworkInterface from the raw data's dictionary.
+    parsed_interface = NetworkInterface(ip_owner_id=association["IpOwnerId"],
+                                        public_dns_name=association["PublicDnsName"],
+                                        mac_address=raw_data["MacAddress"],
+                                        network_interface_id=raw_data["NetworkInterfaceId"],
+                                        owner_id=raw_data["OwnerId"],
+                                        private_dns_name=raw_data["PrivateDnsName"],
+                                        subnet_id=raw_data["SubnetId"], status=raw_data["Status"]
+                                        )
+
+    # check the input dictionary for the optional ip fields and parse the valid ones into the object
+    ipv6_addresses = raw_data.get("Ipv6Addresses")
+    public_ip = association.get("PublicIp")
+    private_ip_address = raw_data.get("PrivateIpAddress")
+    if ipv6_addresses:
+        # aws returns a list of {'Ipv6Address': ...} dictionaries, with the primary address first.
+        parsed_interface.ipv6_address = _parse_optional_ip(ipv6_addresses[0].get("Ipv6Address", ""))
+        if parsed_interface.ipv6_address is None:
+            logging.error("ipv6 address is not valid in network interface with the id %s",
+                          parsed_interface.network_interface_id)
+
+    if public_ip:
+        parsed_interface.public_ip_address = _parse_optional_ip(public_ip)
+        if parsed_interface.public_ip_address is None:
+            logging.debug("public_ip address is not valid in network interface with the id %s",
+                          parsed_interface.network_interface_id)
+
+    if private_ip_address:
+        parsed_interface.private_ip_address = _parse_optional_ip(private_ip_address)
+        if parsed_interface.private_ip_address is None:
+            logging.error("private_ip_address address is not valid in network interface with the id %s",
+                          parsed_interface.network_interface_id)
+    return parsed_interface
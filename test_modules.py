@@ -0,0 +1,53 @@
+from unittest import TestCase, main
+from ipaddress import ip_address
+from modules import from_raw_data_to_frame, from_raw_data_to_network_interface
+import datetime
+
+
+class TestModules(TestCase):
+
+    def test_from_raw_data_to_frame(self):
+        """
+        The test checks that the columnar view is built with one row per instance, that the network
+        interfaces are flattened into a second frame carrying the owning instance's id, and that
+        missing optional fields fall back to their defaults.
+        """
+        # A minimal instance with one network interface and all the optional fields present.
+        first_instance = {'ImageId': 'ami-0d718c3d715cec4a7', 'InstanceId': 'i-0e8bdd2ac54738254', 'InstanceType': 't2.micro', 'LaunchTime': datetime.datetime(2021, 11, 21, 10, 46, 28), 'State': {'Code': 16, 'Name': 'running'}, 'StateTransitionReason': '', 'ClientToken': '', 'RootDeviceName': '/dev/xvda', 'Tags': [{'Key': 'Name', 'Value': 'Candidate test instance 1'}], 'CpuOptions': {'CoreCount': 1, 'ThreadsPerCore': 1}, 'SecurityGroups': [{'GroupName': 'launch-wizard-1', 'GroupId': 'sg-0fecf864e5181d0f6'}], 'RamdiskId': 'ari-12345', 'PlatformDetails': 'Linux/UNIX', 'KernelId': 'aki-12345', 'HostId': 'h-12345', 'NetworkInterfaces': [{'Association': {'IpOwnerId': 'amazon', 'PublicDnsName': 'ec2-18-217-63-24.us-east-2.compute.amazonaws.com', 'PublicIp': '18.217.63.24'}, 'Ipv6Addresses': [], 'MacAddress': '0a:a1:88:c0:28:64', 'NetworkInterfaceId': 'eni-01346a357c542ed94', 'OwnerId': '924736140882', 'PrivateDnsName': 'ip-172-31-37-32.us-east-2.compute.internal', 'PrivateIpAddress': '172.31.37.32', 'SubnetId': 'subnet-6fd65e23', 'Status': 'in-use'}]}
+
+        # A minimal instance without any of the optional fields and without network interfaces.
+        second_instance = {'ImageId': 'ami-00be885d550dcee43', 'InstanceId': 'i-0ea170c53ee0dc00f', 'InstanceType': 't2.micro', 'LaunchTime': datetime.datetime(2021, 11, 21, 10, 51, 22), 'State': {'Code': 16, 'Name': 'running'}, 'StateTransitionReason': '', 'ClientToken': '', 'RootDeviceName': '/dev/xvda', 'Tags': [{'Key': 'Name', 'Value': 'candidate test 2'}], 'CpuOptions': {'CoreCount': 1, 'ThreadsPerCore': 1}, 'SecurityGroups': [{'GroupName': 'launch-wizard-1', 'GroupId': 'sg-07ae7734813859bb4'}], 'NetworkInterfaces': []}
+
+        instances_frame, interfaces_frame = from_raw_data_to_frame([first_instance, second_instance])
+
+        # Every instance column holds one value per input instance, in input order.
+        self.assertEqual(instances_frame['instance_id'], ['i-0e8bdd2ac54738254', 'i-0ea170c53ee0dc00f'])
+        self.assertEqual(instances_frame['image_id'], ['ami-0d718c3d715cec4a7', 'ami-00be885d550dcee43'])
+        self.assertEqual(instances_frame['platform'], ['Linux/UNIX', ''])
+        self.assertEqual(instances_frame['ram_disk_id'], ['ari-12345', ''])
+        self.assertEqual(instances_frame['kernel_id'], ['aki-12345', ''])
+        self.assertEqual(instances_frame['host_id'], ['h-12345', ''])
+
+        # Only the first instance has a network interface, and its row points back to its instance.
+        self.assertEqual(interfaces_frame['instance_id'], ['i-0e8bdd2ac54738254'])
+        self.assertEqual(interfaces_frame['network_interface_id'], ['eni-01346a357c542ed94'])
+        self.assertEqual(interfaces_frame['public_ip_address'], ['18.217.63.24'])
+        self.assertEqual(interfaces_frame['private_ip_address'], ['172.31.37.32'])
+
+    def test_from_raw_data_to_network_interface_ipv6(self):
+        """
+        The test checks that the first address of the Ipv6Addresses list is parsed into the
+        interface, and that missing optional ip fields are simply left empty.
+        """
+        raw_interface = {'Association': {'IpOwnerId': 'amazon', 'PublicDnsName': 'ec2-18-217-63-24.us-east-2.compute.amazonaws.com'}, 'Ipv6Addresses': [{'Ipv6Address': '2600:1f16:67d:2000::1'}], 'MacAddress': '0a:a1:88:c0:28:64', 'NetworkInterfaceId': 'eni-01346a357c542ed94', 'OwnerId': '924736140882', 'PrivateDnsName': 'ip-172-31-37-32.us-east-2.compute.internal', 'SubnetId': 'subnet-6fd65e23', 'Status': 'in-use'}
+
+        parsed_interface = from_raw_data_to_network_interface(raw_interface)
+
+        self.assertEqual(parsed_interface.ipv6_address, ip_address('2600:1f16:67d:2000::1'))
+        self.assertIsNone(parsed_interface.public_ip_address)
+        self.assertIsNone(parsed_interface.private_ip_address)
+
+
+if __name__ == '__main__':
+    # Runs the unittest.main func if the file has been executed.
+    main()